@@ -0,0 +1,250 @@
+"""Fetch the Azure Retail Prices API and export the price list as CSV/Parquet.
+
+Downloads every page of the paginated price list, expands savings plan
+entries into their own rows, derives an hourly price per row and writes
+the results plus a couple of distinct lookup files (regions, VM SKUs).
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import requests
+from numba import njit, prange
+from requests.adapters import HTTPAdapter
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+API_URL = "https://prices.azure.com/api/retail/prices?currencyCode='EUR'"
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0))
+
+
+def fetch_page(url, retries=0, max_retries=5, backoff_factor=2):
+    """Fetch a single page of the price list, retrying on throttling."""
+    logging.debug(f"Fetching data from: {url}")
+    response = SESSION.get(url, timeout=(5, 30))
+    if response.status_code == 429 and retries < max_retries:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            wait_time = float(retry_after)
+        else:
+            wait_time = min(60, random.uniform(1, (backoff_factor ** retries) * 2))
+        logging.warning(f"Throttled, retrying in {wait_time} seconds")
+        time.sleep(wait_time)
+        return fetch_page(url, retries + 1, max_retries, backoff_factor)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def flatten_items(items):
+    """Flatten savings plan entries into standalone rows while items are still dicts."""
+    flat = []
+    for item in items:
+        plans = item.get("savingsPlan")
+        if not plans:
+            if "savingsPlan" in item:
+                item = {k: v for k, v in item.items() if k != "savingsPlan"}
+            flat.append(item)
+            continue
+        base = {k: v for k, v in item.items() if k != "savingsPlan"}
+        for plan in plans:
+            row = dict(base)
+            row["reservationTerm"] = plan.get("term")
+            row["retailPrice"] = plan.get("retailPrice")
+            row["type"] = "SavingsPlan"
+            flat.append(row)
+    return flat
+
+
+def fetch_azure_prices(api_url, max_workers=10):
+    """Walk the paginated API and return raw and savings-plan-flattened Arrow tables."""
+    pending = queue.Queue()
+    pending.put(api_url)
+    raw_tables = []
+    flat_tables = []
+    errors = []
+    pages_fetched = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal pages_fetched
+        while True:
+            url = pending.get()
+            if url is None:
+                return
+            try:
+                data = fetch_page(url)
+                next_page = data.get("NextPageLink")
+                if next_page:
+                    pending.put(next_page)
+                raw_table = None
+                if data["Items"]:
+                    raw_table = pa.Table.from_pylist(data["Items"])
+                    flat_table = pa.Table.from_pylist(flatten_items(data["Items"]))
+                with lock:
+                    if raw_table is not None:
+                        raw_tables.append(raw_table)
+                        flat_tables.append(flat_table)
+                    pages_fetched += 1
+                    if pages_fetched % 100 == 0:
+                        logging.info(f"Fetched {pages_fetched} pages")
+            except Exception as exc:
+                with lock:
+                    errors.append(exc)
+            finally:
+                pending.task_done()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max_workers)]
+    for thread in threads:
+        thread.start()
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    logging.info(f"Fetched {pages_fetched} pages in total")
+    return (
+        pa.concat_tables(raw_tables, promote_options="permissive"),
+        pa.concat_tables(flat_tables, promote_options="permissive"),
+    )
+
+
+def process_additional_columns(df_prices):
+    """Rename the term column and tag Spot / Low Priority SKUs."""
+    df_prices = df_prices.rename(columns={"reservationTerm": "Term"})
+    sku_lower = df_prices["skuName"].str.lower()
+    is_spot = sku_lower.str.contains("spot", regex=False, na=False)
+    is_low_priority = sku_lower.str.contains("low priority", regex=False, na=False)
+    df_prices["type"] = np.where(
+        is_low_priority, "Low Priority", np.where(is_spot, "Spot", df_prices["type"])
+    )
+    return df_prices
+
+
+@njit(parallel=True, cache=True)
+def _hourly_price_kernel(retail_price, term_code, is_reservation, out):
+    for i in prange(retail_price.size):
+        if is_reservation[i] and term_code[i] == 3:
+            out[i] = retail_price[i] / (365 * 3 * 24)
+        elif is_reservation[i] and term_code[i] == 5:
+            out[i] = retail_price[i] / (5 * 365 * 24)
+        elif is_reservation[i] and term_code[i] == 1:
+            out[i] = retail_price[i] / (365 * 24)
+        else:
+            out[i] = retail_price[i]
+
+
+def calculate_hourly_price(df):
+    """Derive an hourly price from the retail price and reservation term."""
+    term_str = df["Term"].astype(str)
+    term_code = np.where(
+        term_str.str.contains("3", na=False),
+        3,
+        np.where(
+            term_str.str.contains("5", na=False),
+            5,
+            np.where(term_str.str.contains("1", na=False), 1, 0),
+        ),
+    ).astype(np.int8)
+    is_reservation = df["type"].eq("Reservation") & df["Term"].notna()
+    is_reservation = is_reservation.fillna(False).to_numpy(dtype=np.bool_)
+    retail_price = df["retailPrice"].to_numpy(dtype=np.float64, na_value=np.nan)
+    hourly_price = np.empty(retail_price.size, dtype=np.float64)
+    _hourly_price_kernel(retail_price, term_code, is_reservation, hourly_price)
+    df["HourlyPrice"] = hourly_price
+    return df
+
+
+def downcast_floats(df):
+    """Downcast float64 columns to float32 ahead of serialization.
+
+    Prices carry at most six significant digits, so float32 halves the
+    bytes written without losing information. tierMinimumUnits is kept at
+    full precision in case of fractional tiers.
+    """
+    for col, dtype in df.dtypes.items():
+        if col == "tierMinimumUnits":
+            continue
+        if str(dtype) == "float64":
+            df[col] = df[col].astype("float32")
+        elif str(dtype) == "double[pyarrow]":
+            df[col] = df[col].astype(pd.ArrowDtype(pa.float32()))
+    return df
+
+
+def write_csv(data, csv_path):
+    """Write a DataFrame or Arrow table to CSV through Arrow's native writer."""
+    if not isinstance(data, pa.Table):
+        data = pa.Table.from_pandas(data, preserve_index=False)
+    pacsv.write_csv(data, csv_path)
+
+
+def export_distinct_data(df_prices, regions_csv_path, skus_csv_path):
+    """Write distinct region and VM SKU lookup files."""
+    distinct_regions = df_prices.drop_duplicates(subset=["armRegionName", "location"])
+    write_csv(distinct_regions[["armRegionName", "location"]], regions_csv_path)
+
+    vm_mask = df_prices["serviceName"].eq("Virtual Machines") & ~df_prices[
+        "armSkuName"
+    ].str.lower().str.contains("type", regex=False, na=False)
+    distinct_skus = df_prices.loc[vm_mask, ["skuName", "armSkuName"]].drop_duplicates(
+        ignore_index=True
+    )
+    write_csv(distinct_skus, skus_csv_path)
+
+
+def get_azure_prices(api_url=API_URL):
+    """Fetch the price list and return the raw Arrow table plus the processed frame."""
+    raw_table, flat_table = fetch_azure_prices(api_url)
+    df_prices = flat_table.to_pandas()
+    df_prices = df_prices.convert_dtypes(dtype_backend="pyarrow")
+    df_prices = process_additional_columns(df_prices)
+    df_prices = calculate_hourly_price(df_prices)
+    df_prices = downcast_floats(df_prices)
+    return raw_table, df_prices
+
+
+def main():
+    output_csv_raw = "azure_raw_prices.csv"
+    output_csv_path = "azure_prices.csv"
+    output_parquet_path = "azure_prices.parquet"
+    regions_csv_path = "azure_regions.csv"
+    skus_csv_path = "azure_vm_skus.csv"
+
+    raw_table, df_prices = get_azure_prices()
+    if "savingsPlan" in raw_table.column_names:
+        raw_table = raw_table.drop_columns(["savingsPlan"])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(write_csv, raw_table, output_csv_raw),
+            executor.submit(write_csv, df_prices, output_csv_path),
+            executor.submit(
+                df_prices.to_parquet,
+                output_parquet_path,
+                index=False,
+                engine="pyarrow",
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=["location", "armRegionName", "serviceName", "currencyCode", "type", "Term"],
+                row_group_size=256_000,
+            ),
+            executor.submit(export_distinct_data, df_prices, regions_csv_path, skus_csv_path),
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+
+if __name__ == "__main__":
+    main()